@@ -0,0 +1,454 @@
+import argparse
+import contextlib
+import csv
+import gc
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from evaluator import Evaluator, _get_ngrams, calculate_rouge_scores
+
+BASELINE_DIR = Path('benchmarks')
+SCRIPT_DIR = Path(__file__).resolve().parent
+# Absolute changes below these are treated as noise, whatever the relative change
+MIN_DELTA = {'seconds': 0.005, 'peak_mb': 0.5}
+TOKEN_POOL_SIZE = 1 << 20  # Words sampled once per corpus; documents are slices of it
+MAX_RUNS = 100  # Upper bound on timed runs per stage when topping up to --min-time
+
+
+# --- 1. Synthetic corpus ---
+def _make_vocabulary(size: int, rng: random.Random) -> Tuple[List[str], List[float]]:
+    """
+    Builds a vocabulary of pseudo-words with Zipfian cumulative weights.
+    """
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(letters) for _ in range(rng.randint(2, 10))))
+    words = sorted(words)
+    rng.shuffle(words)
+    cum_weights = list(itertools.accumulate(1.0 / rank for rank in range(1, size + 1)))
+    return words, cum_weights
+
+
+def _make_text(num_words: int, pool: List[str], rng: random.Random) -> str:
+    """
+    Generates a text of sentences of 8-35 words, with a paragraph break every few sentences.
+
+    The words are a random slice of `pool`, a long stream of Zipf-distributed
+    words, which is much faster than sampling every word of every document.
+    """
+    start = rng.randrange(len(pool))
+    tokens = pool[start:start + num_words]
+    while len(tokens) < num_words:
+        tokens += pool[:num_words - len(tokens)]
+    sentences = []
+    pos = 0
+    while pos < num_words:
+        length = rng.randint(8, 35)
+        sentence = ' '.join(tokens[pos:pos + length])
+        sentences.append(sentence[:1].upper() + sentence[1:] + '.')
+        pos += length
+    paragraphs = []
+    pos = 0
+    while pos < len(sentences):
+        length = rng.randint(3, 8)
+        paragraphs.append(' '.join(sentences[pos:pos + length]))
+        pos += length
+    return '\n\n'.join(paragraphs)
+
+
+def generate_documents(num_docs: int, article_words: int, seed: int) -> Iterator[Dict[str, str]]:
+    """
+    Generates synthetic papers with realistic length distributions, one at a time.
+
+    Article lengths are log-normal around `article_words`, abstracts are
+    normal around 200 words and machine summaries are drawn from the same
+    vocabulary so that ROUGE scores are non-trivial.
+    """
+    rng = random.Random(seed)
+    words, cum_weights = _make_vocabulary(5000, rng)
+    pool = rng.choices(words, cum_weights=cum_weights, k=TOKEN_POOL_SIZE)
+    for paper_id in range(num_docs):
+        text_len = max(200, min(int(rng.lognormvariate(0, 0.6) * article_words), article_words * 8))
+        summary_len = max(50, int(rng.gauss(200, 40)))
+        pred_len = max(50, int(rng.gauss(200, 30)))
+        yield {
+            'paper_id': str(paper_id),
+            'text': _make_text(text_len, pool, rng),
+            'summary': _make_text(summary_len, pool, rng),
+            'summary_ai': _make_text(pred_len, pool, rng),
+        }
+
+
+def write_corpus(documents: Iterator[Dict[str, str]], root: Path) -> Tuple[List[str], List[str]]:
+    """
+    Lays the corpus out on disk the way the pipeline scripts expect it.
+
+    Each document is written as soon as it is generated, so only the abstracts
+    and machine summaries, which the in-process stages need, are kept in memory.
+    Returns them as (targets, predictions).
+    """
+    data_dir = root / 'data'
+    summary_dir = root / 'outputs' / 'train' / 'summary'
+    summary_ai_dir = root / 'outputs' / 'test_features' / 'summary_ai'
+    for directory in (data_dir, summary_dir, summary_ai_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    targets = []
+    predictions = []
+    with open(data_dir / 'train.csv', 'w', newline='', encoding='utf-8') as train_file, \
+            open(data_dir / 'test_features.csv', 'w', newline='', encoding='utf-8') as test_file:
+        train_writer = csv.DictWriter(train_file, fieldnames=['paper_id', 'text', 'summary'])
+        test_writer = csv.DictWriter(test_file, fieldnames=['paper_id', 'text'])
+        train_writer.writeheader()
+        test_writer.writeheader()
+
+        for doc in documents:
+            train_writer.writerow({key: doc[key] for key in ('paper_id', 'text', 'summary')})
+            test_writer.writerow({key: doc[key] for key in ('paper_id', 'text')})
+            with open(summary_dir / f"{doc['paper_id']}.txt", 'w', encoding='utf-8') as f:
+                f.write(doc['summary'])
+            with open(summary_ai_dir / f"{doc['paper_id']}.txt", 'w', encoding='utf-8') as f:
+                f.write(doc['summary_ai'])
+            targets.append(doc['summary'])
+            predictions.append(doc['summary_ai'])
+    return targets, predictions
+
+
+# --- 2. Stages ---
+class Stage(NamedTuple):
+    run: Callable[[], None]
+    setup: Optional[Callable[[], None]] = None  # Untimed, before every run
+    check: Optional[Callable[[], None]] = None  # Untimed, after every run; raises RuntimeError on bad output
+
+
+def _script_stage(module_name: str, function_name: str, outputs: List[Path],
+                  check: Callable[[], None]) -> Stage:
+    """
+    Wraps a pipeline script entry point, importing it lazily so a missing
+    optional dependency only skips that stage.
+
+    The scripts report their own errors and return normally, so `outputs` are
+    removed before every run and `check` verifies that they were written again.
+    """
+    def run():
+        # Stages run from a scratch directory, so make sure the scripts stay importable
+        if str(SCRIPT_DIR) not in sys.path:
+            sys.path.insert(0, str(SCRIPT_DIR))
+        module = __import__(module_name)
+        getattr(module, function_name)()
+
+    def setup():
+        for path in outputs:
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
+
+    return Stage(run, setup, check)
+
+
+def _expect_files(directory: Path, expected: int) -> Callable[[], None]:
+    def check():
+        found = len(list(directory.glob('*.txt'))) if directory.is_dir() else 0
+        if found != expected:
+            raise RuntimeError(f"expected {expected} files in {directory}, found {found}")
+    return check
+
+
+def _expect_lines(paths: List[Path], expected: int) -> Callable[[], None]:
+    def check():
+        missing = [str(path) for path in paths if not path.is_file()]
+        if missing:
+            raise RuntimeError(f"missing output {', '.join(missing)}")
+        found = sum(len(path.read_text(encoding='utf-8').split()) for path in paths)
+        if found != expected:
+            raise RuntimeError(f"expected {expected} entries in {', '.join(map(str, paths))}, found {found}")
+    return check
+
+
+def _expect_csv_rows(path: Path, expected: int) -> Callable[[], None]:
+    def check():
+        if not path.is_file():
+            raise RuntimeError(f"missing output {path}")
+        with open(path, newline='', encoding='utf-8') as f:
+            found = sum(1 for _ in csv.DictReader(f))
+        if found != expected:
+            raise RuntimeError(f"expected {expected} rows in {path}, found {found}")
+    return check
+
+
+def build_stages(targets: List[str], predictions: List[str]) -> Dict[str, Stage]:
+    """
+    Returns the benchmarked stages in pipeline order. Paths are relative to the
+    scratch directory the stages run in.
+    """
+    num_docs = len(targets)
+
+    def get_ngrams():
+        for text in targets:
+            _get_ngrams(text, 2)
+
+    def rouge_2_pairs():
+        for target, prediction in zip(targets, predictions):
+            calculate_rouge_scores(target, prediction, n=2)
+
+    def evaluate(metric):
+        return Stage(lambda: Evaluator(metrics=[metric]).evaluate_predictions(targets, predictions))
+
+    train_text_dir = Path('outputs/train/text')
+    train_summary_dir = Path('outputs/train/summary')
+    test_text_dir = Path('outputs/test_features/text')
+    class_lists = [Path('outputs/structured_files.txt'), Path('outputs/unstructured_files.txt')]
+    summaries_csv = Path('outputs/summaries.csv')
+
+    def check_train_data():
+        _expect_files(train_text_dir, num_docs)()
+        _expect_files(train_summary_dir, num_docs)()
+
+    return {
+        'prepare_train_data': _script_stage('prepare_train_data', 'prepare_train_data',
+                                            [train_text_dir], check_train_data),
+        'prepare_test_data': _script_stage('prepare_test_data', 'prepare_test_data',
+                                           [test_text_dir], _expect_files(test_text_dir, num_docs)),
+        'get_ngrams': Stage(get_ngrams),
+        'calculate_rouge_scores': Stage(rouge_2_pairs),
+        'evaluate_predictions[rouge-2]': evaluate('rouge-2'),
+        'evaluate_predictions[rouge-l]': evaluate('rouge-l'),
+        'evaluate_predictions[rouge-lsum]': evaluate('rouge-lsum'),
+        'classify_files': _script_stage('classify_summaries', 'classify_files',
+                                        class_lists, _expect_lines(class_lists, num_docs)),
+        'create_summary_file': _script_stage('create_summary', 'create_summary_file',
+                                             [summaries_csv], _expect_csv_rows(summaries_csv, num_docs)),
+    }
+
+
+STAGE_NAMES = list(build_stages([], []))
+
+
+def measure(stage: Stage, repeats: int, min_time: float) -> Dict[str, float]:
+    """
+    Times a stage and records its peak traced memory in a separate run.
+
+    The stage runs at least `repeats` times and until `min_time` seconds were
+    spent in it (at most MAX_RUNS times). The median is reported together with
+    the spread of the runs relative to it, so comparisons can allow for noise.
+    """
+    def run_once(trace_memory):
+        if stage.setup:
+            stage.setup()
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            stage.run()
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+        if stage.check:
+            stage.check()
+        return elapsed, peak
+
+    timings = []
+    while len(timings) < repeats or (sum(timings) < min_time and len(timings) < MAX_RUNS):
+        timings.append(run_once(False)[0])
+    # tracemalloc slows execution down, so memory is measured on its own run
+    _, peak = run_once(True)
+
+    median = statistics.median(timings)
+    return {
+        'seconds': median,
+        'spread': (max(timings) - min(timings)) / median if median > 0 else 0.0,
+        'runs': len(timings),
+        'peak_mb': peak / (1024 * 1024),
+    }
+
+
+def run_benchmarks(num_docs: int, article_words: int, seed: int, repeats: int, min_time: float,
+                   only: List[str] = None) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+    """
+    Runs every stage inside a scratch directory holding the synthetic corpus.
+
+    Returns the measurements and, separately, the stages that failed with their error.
+    """
+    results = {}
+    failures = {}
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='whats_up_docs_bench_') as tmp:
+        print(f"Generating {num_docs} synthetic documents (seed {seed})...", flush=True)
+        targets, predictions = write_corpus(generate_documents(num_docs, article_words, seed), Path(tmp))
+        os.chdir(tmp)
+        try:
+            for name, stage in build_stages(targets, predictions).items():
+                if only and name not in only:
+                    continue
+                print(f"Running {name}...", flush=True)
+                # The scripts report progress on stdout/stderr; keep the benchmark output readable
+                captured = io.StringIO()
+                try:
+                    with contextlib.redirect_stdout(captured), contextlib.redirect_stderr(captured):
+                        results[name] = measure(stage, repeats, min_time)
+                except ImportError as e:
+                    print(f"  Skipped: {e}")
+                    continue
+                except RuntimeError as e:
+                    failures[name] = str(e)
+                    print(f"  FAILED: {e}")
+                    for line in captured.getvalue().splitlines()[-5:]:
+                        print(f"    | {line}")
+                    continue
+                result = results[name]
+                print(f"  {result['seconds']:.4f} s median of {result['runs']} runs "
+                      f"(spread {result['spread']:.0%}), peak {result['peak_mb']:.1f} MB")
+        finally:
+            os.chdir(original_cwd)
+    return results, failures
+
+
+# --- 3. Baselines ---
+def default_baseline_path(num_docs: int) -> Path:
+    return BASELINE_DIR / f'baseline_{num_docs}.json'
+
+
+def compare_to_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float,
+                        only: List[str] = None) -> Tuple[List[str], List[str]]:
+    """
+    Compares current stage results with a baseline.
+
+    A stage regresses when its time or peak memory grew by more than MIN_DELTA and
+    by more than `threshold`. For time, the allowed growth is widened to the
+    run-to-run spread recorded in the baseline or measured now, whichever is larger,
+    so noise alone does not fail the check.
+
+    Returns the regression messages and the baseline stages that have no current
+    result. With `only`, stages outside that selection are not reported as missing.
+    """
+    regressions = []
+    missing = [name for name in baseline if name not in results and (not only or name in only)]
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for key, unit in (('seconds', 's'), ('peak_mb', 'MB')):
+            if current[key] - previous[key] < MIN_DELTA[key]:
+                continue
+            allowed = threshold
+            if key == 'seconds':
+                allowed = max(threshold, previous.get('spread', 0.0), current.get('spread', 0.0))
+            if previous[key] > 0 and current[key] > previous[key] * (1 + allowed):
+                change = (current[key] / previous[key] - 1) * 100
+                regressions.append(
+                    f"{name}: {key} {previous[key]:.4f}{unit} -> {current[key]:.4f}{unit} "
+                    f"(+{change:.1f}%, allowed +{allowed:.0%})"
+                )
+    return regressions, missing
+
+
+def main():
+    """Main function of the program"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the pipeline stages on a synthetic corpus and check for regressions against a JSON baseline."
+    )
+    parser.add_argument('--docs', type=int, default=1000, help='Number of synthetic documents (e.g. 1000-100000).')
+    parser.add_argument('--article-words', type=int, default=3000, help='Median article length in words.')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the synthetic corpus.')
+    parser.add_argument('--repeats', type=int, default=7,
+                        help='Minimum timed runs per stage; the median is reported.')
+    parser.add_argument('--min-time', type=float, default=2.0,
+                        help=f'Keep timing a stage until this many seconds were spent in it (up to {MAX_RUNS} runs).')
+    parser.add_argument('--stage', action='append', default=None,
+                        help=f"Only run this stage (can be repeated). One of: {', '.join(STAGE_NAMES)}.")
+    parser.add_argument('--baseline', type=Path, default=None,
+                        help='Baseline JSON file. Defaults to benchmarks/baseline_<docs>.json.')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline.')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed relative slowdown or memory growth before failing (0.2 = 20%%). '
+                             'Slowdowns within the measured run-to-run spread are also allowed.')
+    args = parser.parse_args()
+
+    for option in ('docs', 'article_words', 'repeats'):
+        if getattr(args, option) < 1:
+            parser.error(f"--{option.replace('_', '-')} must be at least 1")
+    if args.min_time < 0 or args.threshold < 0:
+        parser.error("--min-time and --threshold must not be negative")
+
+    unknown = [name for name in args.stage or [] if name not in STAGE_NAMES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}. Choose from: {', '.join(STAGE_NAMES)}")
+
+    baseline_path = args.baseline or default_baseline_path(args.docs)
+
+    # Checking against a missing baseline would silently pass, so refuse before doing any work
+    if not args.save_baseline and not baseline_path.is_file():
+        print(f"Error: No baseline found at {baseline_path}. Run with --save-baseline to create one.")
+        sys.exit(1)
+
+    results, failures = run_benchmarks(
+        args.docs, args.article_words, args.seed, args.repeats, args.min_time, args.stage
+    )
+
+    if failures:
+        print("\nStages failed, their timings are not valid:")
+        for name, error in failures.items():
+            print(f"  - {name}: {error}")
+        sys.exit(1)
+
+    report = {
+        'meta': {
+            'docs': args.docs,
+            'article_words': args.article_words,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+        },
+        'stages': results,
+    }
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {baseline_path}")
+        return
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    if baseline.get('meta', {}).get('seed') != args.seed or baseline.get('meta', {}).get('article_words') != args.article_words:
+        print("\nWarning: baseline was recorded with a different corpus configuration.")
+
+    regressions, missing = compare_to_baseline(results, baseline.get('stages', {}), args.threshold, args.stage)
+
+    # With --stage, a selected stage without a result (e.g. skipped) is only a warning
+    if missing:
+        print(f"\n{'Warning: s' if args.stage else 'S'}tages in the baseline with no current result:")
+        for name in missing:
+            print(f"  - {name}")
+
+    if regressions:
+        print(f"\nRegressions against {baseline_path}:")
+        for message in regressions:
+            print(f"  - {message}")
+    if regressions or (missing and not args.stage):
+        sys.exit(1)
+
+    print(f"\nNo regressions against {baseline_path}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,7 +10,10 @@ import tqdm
 @click.option('--ground-truth-dir', 
               default='outputs/train/summary', 
               help='Directory with ground truth summaries.')
-def main(predictions_dir, ground_truth_dir):
+@click.option('--metrics',
+              default='rouge-2',
+              help='Comma-separated metrics: rouge-1, rouge-2, rouge-l, rouge-lsum.')
+def main(predictions_dir, ground_truth_dir, metrics):
     """
     Evaluates generated summaries against ground truth summaries from specified directories.
     """
@@ -78,7 +81,11 @@ def main(predictions_dir, ground_truth_dir):
 
     # --- 5. Run Evaluation ---
     click.echo("Calculating ROUGE scores...")
-    evaluator = Evaluator(metrics=['rouge-2'])
+    try:
+        evaluator = Evaluator(metrics=[metric.strip() for metric in metrics.split(',') if metric.strip()])
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+        return
     results = evaluator.evaluate_predictions(true_summaries_aligned, pred_summaries_aligned)
 
     # --- 6. Display Report ---
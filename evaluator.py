@@ -1,15 +1,26 @@
 import re
 from collections import Counter
-from typing import List, Dict, Tuple
+from typing import List, Dict, NamedTuple, Tuple
+
+def _tokenize(text: str) -> List[str]:
+    """
+    Lowercases a text and splits it into words on non-alphanumeric characters.
+    """
+    return re.findall(r'\w+', text.lower())
+
+def _split_sentences(text: str) -> List[str]:
+    """
+    Splits a text into sentences on newlines and sentence-final punctuation.
+    """
+    sentences = re.split(r'(?<=[.!?])\s+|\n+', text.strip())
+    return [sentence for sentence in sentences if sentence.strip()]
 
 def _get_ngrams(text: str, n: int) -> Counter:
     """
     Calculates n-grams for a given text.
     """
-    # Simple text normalization: lowercase and split by non-alphanumeric characters
-    words = re.split(r'\W+', text.lower())
-    words = [word for word in words if word]  # Remove empty strings
-    
+    words = _tokenize(text)
+
     ngrams = Counter()
     for i in range(len(words) - n + 1):
         ngram = tuple(words[i:i+n])
@@ -48,6 +59,240 @@ def calculate_rouge_scores(target: str, prediction: str, n: int = 2) -> Dict[str
     return {"precision": precision, "recall": recall, "f1": f1}
 
 
+def _prf(hits: int, total_pred: int, total_target: int) -> Dict[str, float]:
+    """
+    Turns a hit count into precision, recall and F1.
+    """
+    precision = hits / total_pred if total_pred > 0 else 0.0
+    recall = hits / total_target if total_target > 0 else 0.0
+    f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+def _match_masks(a: List[int]) -> Dict[int, int]:
+    """
+    Builds a bitmask per token id with bit i set where a[i] is that token.
+    """
+    masks = {}
+    for i, token in enumerate(a):
+        masks[token] = masks.get(token, 0) | (1 << i)
+    return masks
+
+def _lcs_length(a: List[int], b: List[int]) -> int:
+    """
+    Computes the length of the longest common subsequence of two token id lists.
+
+    Uses the bit-parallel algorithm of Allison-Dix / Hyyrö: one row of the
+    LCS table over `a` is packed into an integer, so each token of `b` costs
+    a handful of big-integer operations instead of len(a) Python steps.
+    """
+    if not a or not b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a  # Wider bit vector, fewer iterations
+    masks = _match_masks(a)
+    full = (1 << len(a)) - 1
+    v = full
+    for token in b:
+        u = v & masks.get(token, 0)
+        v = ((v + u) | (v - u)) & full
+    return len(a) - bin(v).count('1')
+
+_BYTE_REVERSE = bytes(int(f'{i:08b}'[::-1], 2) for i in range(256))
+
+def _reverse_bits(x: int, width: int) -> int:
+    """
+    Reverses the order of the low `width` bits of `x`.
+    """
+    num_bytes = (width + 7) // 8
+    reversed_bytes = x.to_bytes(num_bytes, 'little').translate(_BYTE_REVERSE)
+    return int.from_bytes(reversed_bytes, 'big') >> (num_bytes * 8 - width)
+
+class _PackedSentences(NamedTuple):
+    masks: Dict[int, int]  # Token id -> bits of its positions
+    reversed_masks: Dict[int, int]  # The same masks, bit-reversed
+    segments: List[Tuple[int, int]]  # (offset, length) of each sentence
+    full: int  # All sentence bits, guard bits clear
+    reversed_full: int
+    reversed_last: int  # Bit-reversed mask of the last token of each sentence
+    width: int  # Total number of bits, guard bits included
+
+def _pack_sentences(sentences: List[List[int]]) -> _PackedSentences:
+    """
+    Lays several non-empty token id lists out side by side in one bit vector.
+
+    Sentence k occupies `length` bits from `offset`, followed by a zero guard bit
+    that absorbs the carry of the LCS recurrence, so the sentences never
+    interfere with each other. Match masks are kept both in this layout and
+    bit-reversed, for the backtrack in `_lcs_union`.
+    """
+    width = sum(len(sentence) + 1 for sentence in sentences)
+    masks = {}
+    reversed_masks = {}
+    segments = []
+    full = 0
+    last = 0
+    offset = 0
+    for sentence in sentences:
+        for i, token in enumerate(sentence):
+            masks[token] = masks.get(token, 0) | (1 << (offset + i))
+            reversed_masks[token] = reversed_masks.get(token, 0) | (1 << (width - 1 - offset - i))
+        segments.append((offset, len(sentence)))
+        full |= ((1 << len(sentence)) - 1) << offset
+        last |= 1 << (offset + len(sentence) - 1)
+        offset += len(sentence) + 1
+    return _PackedSentences(
+        masks=masks,
+        reversed_masks=reversed_masks,
+        segments=segments,
+        full=full,
+        reversed_full=_reverse_bits(full, width),
+        reversed_last=_reverse_bits(last, width),
+        width=width,
+    )
+
+def _lcs_union(packed: _PackedSentences, b: List[int]) -> int:
+    """
+    Finds one longest common subsequence of `b` with every packed sentence.
+
+    Runs the bit-parallel recurrence of `_lcs_length` for all sentences at once,
+    then backtracks from the end of `b` breaking ties as rouge_score does: match
+    when the tokens are equal, otherwise step up while the LCS does not shrink.
+    The backtrack works on bit-reversed rows so that an addition carry finds,
+    for every sentence simultaneously, the next position where it must match
+    or step left. Returns the matched positions as a bit-reversed mask.
+    """
+    masks, reversed_masks = packed.masks, packed.reversed_masks
+    full, reversed_full, width = packed.full, packed.reversed_full, packed.width
+    cursor = packed.reversed_last
+    if not any(token in masks for token in b):
+        return 0  # No token in common
+
+    rows = []
+    v = full
+    for token in b:
+        token_mask = masks.get(token)
+        if token_mask is not None:
+            u = v & token_mask
+            v = ((v + u) | (v - u)) & full
+        rows.append(v)
+
+    # _reverse_bits inlined, this loop is the hot path of ROUGE-Lsum
+    num_bytes = (width + 7) // 8
+    padding = num_bytes * 8 - width
+    union = 0
+    for j in range(len(b) - 1, -1, -1):
+        if not cursor:
+            break
+        column_mask = reversed_masks.get(b[j], 0)
+        reversed_row = int.from_bytes(
+            (full ^ rows[j]).to_bytes(num_bytes, 'little').translate(_BYTE_REVERSE), 'big'
+        ) >> padding
+        # Positions where the backtrack cannot step up: the LCS grows there or b[j] matches
+        stops = reversed_row | column_mask
+        found = (cursor + (reversed_full & ~stops)) & stops
+        matched = found & column_mask
+        union |= matched
+        cursor = ((matched << 1) | (found ^ matched)) & reversed_full
+    return union
+
+def _unpack_positions(packed: _PackedSentences, union: int) -> List[List[int]]:
+    """
+    Splits a bit-reversed position mask from `_lcs_union` into sorted indices per sentence.
+    """
+    bits = _reverse_bits(union, packed.width)
+    return [[i for i in range(length) if (bits >> (offset + i)) & 1] for offset, length in packed.segments]
+
+def _lcs_indices(a: List[int], b: List[int]) -> List[int]:
+    """
+    Returns the positions in `a` of one longest common subsequence of `a` and `b`.
+    """
+    if not a or not b:
+        return []
+    packed = _pack_sentences([a])
+    return _unpack_positions(packed, _lcs_union(packed, b))[0]
+
+def _to_ids(vocab: Dict[str, int], tokens: List[str]) -> List[int]:
+    """
+    Maps tokens to integer ids, growing the shared vocabulary as needed.
+    """
+    return [vocab.setdefault(token, len(vocab)) for token in tokens]
+
+def calculate_rouge_l_scores(target: str, prediction: str) -> Dict[str, float]:
+    """
+    Calculates ROUGE-L precision, recall, and F1-score.
+
+    Args:
+        target (str): The ground truth summary.
+        prediction (str): The generated summary.
+
+    Returns:
+        Dict[str, float]: A dictionary with 'precision', 'recall', and 'f1'.
+    """
+    if not prediction or not target:
+        return {"precision": 0.0, "recall": 0.0, "f1": 0.0}
+
+    vocab = {}
+    target_ids = _to_ids(vocab, _tokenize(target))
+    pred_ids = _to_ids(vocab, _tokenize(prediction))
+
+    lcs = _lcs_length(target_ids, pred_ids)
+    return _prf(lcs, len(pred_ids), len(target_ids))
+
+def calculate_rouge_lsum_scores(target: str, prediction: str) -> Dict[str, float]:
+    """
+    Calculates summary-level ROUGE-Lsum precision, recall, and F1-score.
+
+    Each target sentence is matched against every predicted sentence and the
+    union of the LCS hits is counted, with each token clipped to the number of
+    times it occurs in both texts.
+
+    Args:
+        target (str): The ground truth summary.
+        prediction (str): The generated summary.
+
+    Returns:
+        Dict[str, float]: A dictionary with 'precision', 'recall', and 'f1'.
+    """
+    if not prediction or not target:
+        return {"precision": 0.0, "recall": 0.0, "f1": 0.0}
+
+    vocab = {}
+    target_sents = [_to_ids(vocab, _tokenize(s)) for s in _split_sentences(target)]
+    pred_sents = [_to_ids(vocab, _tokenize(s)) for s in _split_sentences(prediction)]
+    target_sents = [s for s in target_sents if s]
+    pred_sents = [s for s in pred_sents if s]
+
+    target_counts = Counter(token for s in target_sents for token in s)
+    pred_counts = Counter(token for s in pred_sents for token in s)
+    total_target = sum(target_counts.values())
+    total_pred = sum(pred_counts.values())
+
+    # Each predicted sentence is matched against all target sentences at once
+    packed = _pack_sentences(target_sents)
+    union = 0
+    for pred_sent in pred_sents:
+        union |= _lcs_union(packed, pred_sent)
+
+    hits = 0
+    for target_sent, indices in zip(target_sents, _unpack_positions(packed, union)):
+        for i in indices:
+            token = target_sent[i]
+            if target_counts[token] > 0 and pred_counts[token] > 0:
+                hits += 1
+                target_counts[token] -= 1
+                pred_counts[token] -= 1
+
+    return _prf(hits, total_pred, total_target)
+
+
+_METRIC_FUNCTIONS = {
+    'rouge-1': lambda target, prediction: calculate_rouge_scores(target, prediction, n=1),
+    'rouge-2': lambda target, prediction: calculate_rouge_scores(target, prediction, n=2),
+    'rouge-l': calculate_rouge_l_scores,
+    'rouge-lsum': calculate_rouge_lsum_scores,
+}
+
+
 class Evaluator:
     """
     Handles the evaluation of generated summaries against ground truth abstracts.
@@ -58,6 +303,8 @@ class Evaluator:
 
         Args:
             metrics (List[str], optional): List of metrics to compute. 
+                                           Supported: 'rouge-1', 'rouge-2',
+                                           'rouge-l', 'rouge-lsum'.
                                            Defaults to ['rouge-2'].
         """
         if metrics is None:
@@ -65,6 +312,10 @@ class Evaluator:
         else:
             self.metrics = metrics
 
+        unknown = [metric for metric in self.metrics if metric not in _METRIC_FUNCTIONS]
+        if unknown:
+            raise ValueError(f"Unsupported metrics: {', '.join(unknown)}")
+
     def evaluate_predictions(self, true_summaries: List[str], pred_summaries: List[str]) -> Dict[str, float]:
         """
         Evaluates a list of predicted summaries against true summaries.
@@ -84,12 +335,10 @@ class Evaluator:
 
         for true_summary, pred_summary in zip(true_summaries, pred_summaries):
             for metric in self.metrics:
-                if metric == 'rouge-2':
-                    scores = calculate_rouge_scores(true_summary, pred_summary, n=2)
-                    total_scores[metric]['precision'] += scores['precision']
-                    total_scores[metric]['recall'] += scores['recall']
-                    total_scores[metric]['f1'] += scores['f1']
-                # Add other metrics like rouge-1, rouge-l here if needed
+                scores = _METRIC_FUNCTIONS[metric](true_summary, pred_summary)
+                total_scores[metric]['precision'] += scores['precision']
+                total_scores[metric]['recall'] += scores['recall']
+                total_scores[metric]['f1'] += scores['f1']
 
         average_scores = {}
         for metric, scores in total_scores.items():
@@ -118,8 +367,12 @@ if __name__ == '__main__':
     rouge2_scores = calculate_rouge_scores(true_abstract, generated_abstract, n=2)
     print(f"ROUGE-2 Scores: {rouge2_scores}")
 
+    # ROUGE-L / ROUGE-Lsum examples
+    print(f"ROUGE-L Scores: {calculate_rouge_l_scores(true_abstract, generated_abstract)}")
+    print(f"ROUGE-Lsum Scores: {calculate_rouge_lsum_scores(true_abstract, generated_abstract)}")
+
     # Evaluator class example
-    evaluator = Evaluator(metrics=['rouge-2'])
+    evaluator = Evaluator(metrics=['rouge-2', 'rouge-l', 'rouge-lsum'])
     results = evaluator.evaluate_predictions([true_abstract], [generated_abstract])
     print(f"\nEvaluation Results: {results}")
     
@@ -1,7 +1,12 @@
 import os
+import re
+import json
+import hashlib
 import pathlib
 import argparse
+import tempfile
 from time import sleep
+from concurrent.futures import ThreadPoolExecutor
 
 import google.generativeai as genai
 from dotenv import load_dotenv
@@ -34,12 +39,18 @@ safety_settings = [
 ]
 
 # Initialize the model
+MODEL_NAME = "gemini-2.5-flash-lite"
 model = genai.GenerativeModel(
-    model_name="gemini-2.5-flash-lite",
+    model_name=MODEL_NAME,
     safety_settings=safety_settings,
     generation_config=generation_config,
 )
 
+# Hierarchical (map-reduce) summarization settings
+CHUNK_WORDS = 3000  # Target size of a chunk in the map step
+HIERARCHICAL_MIN_WORDS = 12000  # In 'auto' mode, longer documents are summarized hierarchically
+CHUNK_CACHE_DIR = pathlib.Path('outputs/chunk_cache')
+
 
 # --- 2. Loading the improved prompt ---
 def get_improved_prompt():
@@ -110,10 +121,149 @@ def get_prompt_from_report():
     return prompt_text
 
 
-# --- 3. Main function ---
-def generate_summary_for_file(input_path, output_path, prompt_template):
+# --- Prompt for the map step of hierarchical summarization ---
+def get_chunk_prompt():
+    prompt_text = '''**Task:** You are given one consecutive part of a longer academic document. Summarize this part so that it can later be merged with the summaries of the other parts into a single abstract.
+
+**Instructions:**
+1. Write one paragraph of 80-150 words.
+2. Keep the research question, methodology, data, key findings and conclusions that appear in this part, if any.
+3. Preserve the exact technical terms, proper nouns, numbers and specialized vocabulary from the text.
+4. Only include information explicitly stated in this part. Do not speculate about the rest of the document.
+
+**Document part:**
+{chunk}
+'''
+    return prompt_text
+
+
+# --- 3. Hierarchical (map-reduce) summarization ---
+def _split_oversized(text, max_words):
+    """Splits a block that is too long on lines, then sentences, then plain word windows."""
+    for pattern in (r'\n+', r'(?<=[.!?])\s+'):
+        pieces = [p.strip() for p in re.split(pattern, text) if p.strip()]
+        if len(pieces) > 1:
+            result = []
+            for piece in pieces:
+                if len(piece.split()) > max_words:
+                    result.extend(_split_oversized(piece, max_words))
+                else:
+                    result.append(piece)
+            return result
+
+    words = text.split()
+    return [' '.join(words[i:i + max_words]) for i in range(0, len(words), max_words)]
+
+
+def split_into_chunks(text, max_words=CHUNK_WORDS):
+    """
+    Splits a document into chunks of at most `max_words` words on paragraph boundaries.
+
+    Consecutive paragraphs (and section headings, which are paragraphs of their own)
+    are packed together; a single paragraph longer than `max_words` is split further.
+    """
+    pieces = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph.split()) > max_words:
+            pieces.extend(_split_oversized(paragraph, max_words))
+        else:
+            pieces.append(paragraph)
+
+    chunks = []
+    current, current_words = [], 0
+    for piece in pieces:
+        piece_words = len(piece.split())
+        if current and current_words + piece_words > max_words:
+            chunks.append('\n\n'.join(current))
+            current, current_words = [], 0
+        current.append(piece)
+        current_words += piece_words
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
+
+
+def _generate(prompt):
+    """Sends a prompt to Gemini and returns the stripped response text."""
+    response = model.generate_content(prompt)
+    if not response or not response.text:
+        raise ValueError("Empty response from Gemini API")
+    return response.text.strip()
+
+
+def summarize_chunk(chunk, chunk_prompt_template, cache_dir=CHUNK_CACHE_DIR):
+    """
+    Summarizes one chunk (map step), reusing a cached summary when available.
+
+    The cache key covers the model, its generation settings, the chunk prompt and
+    the chunk text, so changing only the reduce prompt never repeats this step.
+    """
+    cache_dir = pathlib.Path(cache_dir)
+    key_source = json.dumps(
+        [MODEL_NAME, generation_config, chunk_prompt_template, chunk], sort_keys=True, ensure_ascii=False
+    )
+    cache_path = cache_dir / f"{hashlib.sha256(key_source.encode('utf-8')).hexdigest()}.txt"
+
+    if cache_path.is_file():
+        return cache_path.read_text(encoding='utf-8')
+
+    summary = _generate(chunk_prompt_template.format(chunk=chunk))
+
+    # Write to a temporary file first so concurrent runs never see a partial summary
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_dir, suffix='.tmp', delete=False) as f:
+        f.write(summary)
+    pathlib.Path(f.name).replace(cache_path)
+    return summary
+
+
+def generate_hierarchical_summary(article_text, prompt_template, chunk_prompt_template=None,
+                                  chunk_words=CHUNK_WORDS, max_workers=None,
+                                  cache_dir=CHUNK_CACHE_DIR):
+    """
+    Summarizes a long document with map-reduce.
+
+    The document is split into chunks that are summarized concurrently (map), then
+    `prompt_template` is applied to the ordered chunk summaries to write the final
+    abstract (reduce). By default every chunk gets its own worker, so latency is
+    bounded by the slowest chunk plus the reduce call rather than by the total
+    document length. `max_workers` caps the concurrent requests (e.g. for API rate
+    limits), at the cost of running the map step in several rounds.
+    """
+    if chunk_prompt_template is None:
+        chunk_prompt_template = get_chunk_prompt()
+
+    chunks = split_into_chunks(article_text, chunk_words)
+    print(f"   Split document into {len(chunks)} chunks of up to {chunk_words} words.")
+
+    workers = len(chunks) if max_workers is None else max(1, min(max_workers, len(chunks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunk_summaries = list(executor.map(
+            lambda chunk: summarize_chunk(chunk, chunk_prompt_template, cache_dir), chunks
+        ))
+
+    merged = '\n\n'.join(
+        f"[Part {i} of {len(chunk_summaries)}]\n{summary}" for i, summary in enumerate(chunk_summaries, 1)
+    )
+    document = (
+        "The document below is given as summaries of its consecutive parts, in order. "
+        "Treat them together as the full source document.\n\n" + merged
+    )
+    return _generate(prompt_template.format(document=document))
+
+
+# --- 4. Main function ---
+def generate_summary_for_file(input_path, output_path, prompt_template, mode='single',
+                              min_hierarchical_words=HIERARCHICAL_MIN_WORDS, map_workers=None):
     """
     Reads a file, generates a summary for it using Gemini, and saves the result.
+
+    `mode` is 'single' (whole document in one prompt), 'hierarchical' (map-reduce
+    over chunks) or 'auto' (hierarchical for documents over `min_hierarchical_words`).
+    `map_workers` caps the concurrent map requests; by default there is one per chunk.
     """
     input_path = pathlib.Path(input_path)
     output_path = pathlib.Path(output_path)
@@ -137,19 +287,20 @@ def generate_summary_for_file(input_path, output_path, prompt_template):
         print("Error: File is empty or contains only whitespace")
         return
 
-    # Format the prompt with the article text
-    full_prompt = prompt_template.format(document=article_text)
+    use_hierarchical = mode == 'hierarchical' or (
+        mode == 'auto' and len(article_text.split()) > min_hierarchical_words
+    )
 
-    print("2. Sending request to Gemini API to generate summary...")
     try:
-        response = model.generate_content(full_prompt)
-
-        # Check if a response was received
-        if not response or not response.text:
-            print("Error: Empty response from Gemini API")
-            return
+        if use_hierarchical:
+            print("2. Sending requests to Gemini API to generate a hierarchical summary...")
+            generated_summary = generate_hierarchical_summary(article_text, prompt_template, max_workers=map_workers)
+        else:
+            # Format the prompt with the article text
+            full_prompt = prompt_template.format(document=article_text)
 
-        generated_summary = response.text.strip()
+            print("2. Sending request to Gemini API to generate summary...")
+            generated_summary = _generate(full_prompt)
 
     except Exception as e:
         print(f"Error calling Gemini API: {e}")
@@ -202,6 +353,21 @@ def main():
         default=None,
         help='Manually specify the file number to start from. Overrides automatic resume.'
     )
+    parser.add_argument(
+        '--mode',
+        choices=['single', 'hierarchical', 'auto'],
+        default='single',
+        help=f'Summarize each document in one prompt, with map-reduce over chunks, or choose '
+             f'automatically (map-reduce above {HIERARCHICAL_MIN_WORDS} words). Default: single.'
+    )
+    parser.add_argument(
+        '--map-workers',
+        type=int,
+        default=None,
+        help='Maximum concurrent map requests per document in hierarchical mode. Default: one per chunk, '
+             'so latency follows the longest chunk; a lower cap eases API rate limits but runs the map '
+             'step in several rounds.'
+    )
     args = parser.parse_args()
 
     # Define directory paths
@@ -261,7 +427,8 @@ def main():
             print(f"({i}/{len(files_to_process)}) Processing file: {input_path}")
 
             # Execute the main task
-            generate_summary_for_file(input_path, output_path, prompt_template)
+            generate_summary_for_file(input_path, output_path, prompt_template, mode=args.mode,
+                                      map_workers=args.map_workers)
 
             sleep(5)
 
@@ -0,0 +1,128 @@
+import pytest
+
+from benchmark import (
+    _expect_csv_rows,
+    _expect_files,
+    _expect_lines,
+    compare_to_baseline,
+    generate_documents,
+    write_corpus,
+)
+
+
+def _result(seconds, peak_mb=10.0, spread=0.0):
+    return {'seconds': seconds, 'peak_mb': peak_mb, 'spread': spread, 'runs': 7}
+
+
+# --- compare_to_baseline ---
+def test_unchanged_results_pass():
+    baseline = {'stage': _result(1.0)}
+    assert compare_to_baseline({'stage': _result(1.0)}, baseline, 0.2) == ([], [])
+
+
+def test_slowdown_beyond_threshold_regresses():
+    regressions, missing = compare_to_baseline({'stage': _result(1.3)}, {'stage': _result(1.0)}, 0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith('stage: seconds')
+    assert missing == []
+
+
+def test_slowdown_within_threshold_passes():
+    regressions, _ = compare_to_baseline({'stage': _result(1.15)}, {'stage': _result(1.0)}, 0.2)
+    assert regressions == []
+
+
+def test_slowdown_within_recorded_spread_passes():
+    baseline = {'stage': _result(1.0, spread=0.5)}
+    assert compare_to_baseline({'stage': _result(1.4)}, baseline, 0.2)[0] == []
+    assert len(compare_to_baseline({'stage': _result(1.6)}, baseline, 0.2)[0]) == 1
+
+
+def test_slowdown_within_current_spread_passes():
+    regressions, _ = compare_to_baseline({'stage': _result(1.4, spread=0.5)}, {'stage': _result(1.0)}, 0.2)
+    assert regressions == []
+
+
+def test_changes_below_noise_floor_pass():
+    # +100% but only 2 ms, and +100% memory but only 0.2 MB
+    results = {'stage': _result(0.004, peak_mb=0.4)}
+    baseline = {'stage': _result(0.002, peak_mb=0.2)}
+    assert compare_to_baseline(results, baseline, 0.2) == ([], [])
+
+
+def test_memory_growth_regresses():
+    regressions, _ = compare_to_baseline({'stage': _result(1.0, peak_mb=20.0)}, {'stage': _result(1.0)}, 0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith('stage: peak_mb')
+
+
+def test_speedups_and_new_stages_pass():
+    results = {'stage': _result(0.5), 'new_stage': _result(3.0)}
+    assert compare_to_baseline(results, {'stage': _result(1.0)}, 0.2) == ([], [])
+
+
+def test_baseline_stage_without_result_is_missing():
+    baseline = {'stage': _result(1.0), 'skipped': _result(1.0)}
+    regressions, missing = compare_to_baseline({'stage': _result(1.0)}, baseline, 0.2)
+    assert regressions == []
+    assert missing == ['skipped']
+
+
+def test_stages_excluded_by_selection_are_not_missing():
+    baseline = {'stage': _result(1.0), 'other': _result(1.0), 'skipped': _result(1.0)}
+    results = {'stage': _result(1.0)}
+    assert compare_to_baseline(results, baseline, 0.2, only=['stage'])[1] == []
+    assert compare_to_baseline(results, baseline, 0.2, only=['stage', 'skipped'])[1] == ['skipped']
+
+
+def test_baseline_without_spread_uses_threshold():
+    baseline = {'stage': {'seconds': 1.0, 'peak_mb': 10.0}}
+    assert len(compare_to_baseline({'stage': _result(1.3)}, baseline, 0.2)[0]) == 1
+
+
+# --- Output checks ---
+def test_expect_files(tmp_path):
+    for i in range(3):
+        (tmp_path / f'{i}.txt').write_text('x')
+    _expect_files(tmp_path, 3)()
+    with pytest.raises(RuntimeError):
+        _expect_files(tmp_path, 4)()
+    with pytest.raises(RuntimeError):
+        _expect_files(tmp_path / 'missing', 3)()
+
+
+def test_expect_lines(tmp_path):
+    structured = tmp_path / 'structured_files.txt'
+    unstructured = tmp_path / 'unstructured_files.txt'
+    structured.write_text('0.txt\n2.txt')
+    unstructured.write_text('')
+    _expect_lines([structured, unstructured], 2)()
+    with pytest.raises(RuntimeError):
+        _expect_lines([structured, unstructured], 3)()
+    unstructured.unlink()
+    with pytest.raises(RuntimeError):
+        _expect_lines([structured, unstructured], 2)()
+
+
+def test_expect_csv_rows(tmp_path):
+    path = tmp_path / 'summaries.csv'
+    with pytest.raises(RuntimeError):
+        _expect_csv_rows(path, 2)()
+    path.write_text('paper_id,summary\n0,"a, b"\n1,"multi\nline"\n')
+    _expect_csv_rows(path, 2)()
+    with pytest.raises(RuntimeError):
+        _expect_csv_rows(path, 3)()
+
+
+# --- Synthetic corpus ---
+def test_write_corpus_lays_out_pipeline_inputs(tmp_path):
+    targets, predictions = write_corpus(generate_documents(5, 300, seed=1), tmp_path)
+    assert len(targets) == len(predictions) == 5
+    _expect_files(tmp_path / 'outputs' / 'train' / 'summary', 5)()
+    _expect_files(tmp_path / 'outputs' / 'test_features' / 'summary_ai', 5)()
+    _expect_csv_rows(tmp_path / 'data' / 'train.csv', 5)()
+    _expect_csv_rows(tmp_path / 'data' / 'test_features.csv', 5)()
+
+
+def test_generate_documents_is_deterministic():
+    assert list(generate_documents(3, 300, seed=7)) == list(generate_documents(3, 300, seed=7))
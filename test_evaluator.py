@@ -0,0 +1,142 @@
+import random
+from collections import Counter
+
+import pytest
+
+from evaluator import (
+    Evaluator,
+    _lcs_indices,
+    _lcs_length,
+    _split_sentences,
+    _tokenize,
+    calculate_rouge_l_scores,
+    calculate_rouge_lsum_scores,
+)
+
+
+# --- Reference implementation (plain DP, backtrack as in rouge_score) ---
+def _dp_table(a, b):
+    table = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            if a[i - 1] == b[j - 1]:
+                table[i][j] = table[i - 1][j - 1] + 1
+            else:
+                table[i][j] = max(table[i - 1][j], table[i][j - 1])
+    return table
+
+
+def _dp_lcs_indices(a, b):
+    table = _dp_table(a, b)
+    i, j = len(a), len(b)
+    indices = []
+    while i > 0 and j > 0:
+        if a[i - 1] == b[j - 1]:
+            indices.insert(0, i - 1)
+            i -= 1
+            j -= 1
+        elif table[i][j - 1] > table[i - 1][j]:
+            j -= 1
+        else:
+            i -= 1
+    return indices
+
+
+def _reference_lsum_f1(target, prediction):
+    target_sents = [s for s in (_tokenize(s) for s in _split_sentences(target)) if s]
+    pred_sents = [s for s in (_tokenize(s) for s in _split_sentences(prediction)) if s]
+    target_counts = Counter(token for s in target_sents for token in s)
+    pred_counts = Counter(token for s in pred_sents for token in s)
+    total_target = sum(target_counts.values())
+    total_pred = sum(pred_counts.values())
+
+    hits = 0
+    for target_sent in target_sents:
+        union = sorted(set().union(*(_dp_lcs_indices(target_sent, p) for p in pred_sents)))
+        for i in union:
+            token = target_sent[i]
+            if target_counts[token] > 0 and pred_counts[token] > 0:
+                hits += 1
+                target_counts[token] -= 1
+                pred_counts[token] -= 1
+
+    precision = hits / total_pred if total_pred else 0.0
+    recall = hits / total_target if total_target else 0.0
+    return 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+
+def _random_ids(rng, alphabet):
+    return [rng.randrange(alphabet) for _ in range(rng.randint(0, 80))]
+
+
+def _random_text(rng):
+    words = 'a b c d e f g h'.split()
+    return ' '.join(rng.choice(words) + rng.choice(['', '', '.']) for _ in range(rng.randint(1, 50)))
+
+
+# --- LCS ---
+def test_lcs_length_matches_dp():
+    rng = random.Random(0)
+    for _ in range(2000):
+        a = _random_ids(rng, rng.choice([2, 5, 30]))
+        b = _random_ids(rng, rng.choice([2, 5, 30]))
+        assert _lcs_length(a, b) == _dp_table(a, b)[-1][-1]
+
+
+def test_lcs_indices_match_dp_backtrack():
+    rng = random.Random(1)
+    for _ in range(2000):
+        a = _random_ids(rng, rng.choice([2, 5, 30]))
+        b = _random_ids(rng, rng.choice([2, 5, 30]))
+        assert _lcs_indices(a, b) == _dp_lcs_indices(a, b)
+
+
+def test_lcs_of_long_sequences():
+    a = list(range(500)) * 2
+    b = list(range(0, 500, 2))
+    assert _lcs_length(a, b) == 250
+    assert _lcs_indices(a, b) == _dp_lcs_indices(a, b)
+
+
+# --- ROUGE-L / ROUGE-Lsum ---
+def test_rouge_l_hand_computed():
+    # LCS "the cat on the mat" = 5 of 6 target and 7 predicted tokens
+    scores = calculate_rouge_l_scores('the cat sat on the mat', 'the cat was found on the mat')
+    assert scores['precision'] == pytest.approx(5 / 7)
+    assert scores['recall'] == pytest.approx(5 / 6)
+    assert scores['f1'] == pytest.approx(2 * (5 / 7) * (5 / 6) / (5 / 7 + 5 / 6))
+
+
+def test_rouge_lsum_hand_computed():
+    # "a b c" matches in full through both predicted sentences; "d e" only through "d"
+    scores = calculate_rouge_lsum_scores('a b c. d e.', 'a b. c d.')
+    assert scores['precision'] == pytest.approx(1.0)
+    assert scores['recall'] == pytest.approx(4 / 5)
+
+
+def test_rouge_lsum_matches_reference():
+    rng = random.Random(2)
+    for _ in range(500):
+        target, prediction = _random_text(rng), _random_text(rng)
+        assert calculate_rouge_lsum_scores(target, prediction)['f1'] == pytest.approx(
+            _reference_lsum_f1(target, prediction)
+        )
+
+
+def test_empty_inputs_score_zero():
+    assert calculate_rouge_l_scores('', 'text')['f1'] == 0.0
+    assert calculate_rouge_lsum_scores('text', '')['f1'] == 0.0
+    assert calculate_rouge_lsum_scores('...', 'text')['f1'] == 0.0
+
+
+# --- Evaluator ---
+def test_evaluator_reports_all_metrics():
+    evaluator = Evaluator(metrics=['rouge-2', 'rouge-l', 'rouge-lsum'])
+    results = evaluator.evaluate_predictions(['the cat sat on the mat'], ['the cat sat on the mat'])
+    for metric in ('rouge-2', 'rouge-l', 'rouge-lsum'):
+        assert results[f'avg_{metric}_f1'] == pytest.approx(1.0)
+
+
+def test_evaluator_rejects_unknown_metric():
+    with pytest.raises(ValueError):
+        Evaluator(metrics=['bleu'])
@@ -0,0 +1,147 @@
+import os
+import threading
+
+import pytest
+
+pytest.importorskip('google.generativeai')
+pytest.importorskip('dotenv')
+
+# The module configures the Gemini client on import and requires a key
+os.environ.setdefault('GEMINI_API_KEY', 'test-key')
+
+import generate_summary  # noqa: E402
+from generate_summary import (  # noqa: E402
+    generate_hierarchical_summary,
+    generate_summary_for_file,
+    split_into_chunks,
+)
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    """Replaces the Gemini call with a stub and records every prompt sent to it."""
+    sent = []
+    lock = threading.Lock()
+
+    def generate_content(prompt):
+        with lock:
+            sent.append(prompt)
+        if 'Document part:' in prompt:
+            # Map step: echo the first word of the chunk so the reduce input shows the order
+            first_word = prompt.split('**Document part:**')[1].split()[0]
+            return _FakeResponse(f"summary of {first_word}")
+        return _FakeResponse("final abstract")
+
+    monkeypatch.setattr(generate_summary.model, 'generate_content', generate_content)
+    return sent
+
+
+def _paragraph(tag, num_words):
+    return ' '.join(f"{tag}{i}" for i in range(num_words))
+
+
+def _map_prompts(sent):
+    return [prompt for prompt in sent if 'Document part:' in prompt]
+
+
+# --- split_into_chunks ---
+def test_paragraphs_are_packed_up_to_the_limit():
+    text = '\n\n'.join(_paragraph(f"p{i}_", 1000) for i in range(7))
+    chunks = split_into_chunks(text, max_words=3000)
+    assert [len(chunk.split()) for chunk in chunks] == [3000, 3000, 1000]
+    assert chunks[0].count('\n\n') == 2  # Paragraph breaks are kept inside a chunk
+
+
+def test_chunks_keep_document_order():
+    text = '\n\n'.join(_paragraph(f"p{i}_", 700) for i in range(10))
+    chunks = split_into_chunks(text, max_words=3000)
+    assert ' '.join(chunks).split() == text.split()
+
+
+def test_oversized_paragraph_falls_back_to_lines():
+    paragraph = '\n'.join(_paragraph(f"l{i}_", 400) for i in range(5))
+    chunks = split_into_chunks(paragraph, max_words=1000)
+    assert [len(chunk.split()) for chunk in chunks] == [800, 800, 400]
+    assert ' '.join(chunks).split() == paragraph.split()
+
+
+def test_oversized_line_falls_back_to_sentences():
+    paragraph = ' '.join(_paragraph(f"s{i}_", 300) + '.' for i in range(5))
+    chunks = split_into_chunks(paragraph, max_words=1000)
+    assert [len(chunk.split()) for chunk in chunks] == [900, 600]
+    assert ' '.join(chunks).split() == paragraph.split()
+
+
+def test_text_without_boundaries_falls_back_to_word_windows():
+    paragraph = _paragraph('w', 2500)
+    chunks = split_into_chunks(paragraph, max_words=1000)
+    assert [len(chunk.split()) for chunk in chunks] == [1000, 1000, 500]
+    assert ' '.join(chunks).split() == paragraph.split()
+
+
+def test_short_document_is_one_chunk():
+    assert split_into_chunks('Title\n\nA short body.', max_words=3000) == ['Title\n\nA short body.']
+
+
+# --- generate_hierarchical_summary ---
+def test_reduce_receives_chunk_summaries_in_order(prompts, tmp_path):
+    text = '\n\n'.join(_paragraph(f"p{i}_", 1000) for i in range(5))
+    summary = generate_hierarchical_summary(text, 'Reduce:\n{document}', chunk_words=1000, cache_dir=tmp_path)
+
+    assert summary == 'final abstract'
+    assert len(_map_prompts(prompts)) == 5
+    reduce_prompt = prompts[-1]
+    positions = [reduce_prompt.index(f"summary of p{i}_0") for i in range(5)]
+    assert positions == sorted(positions)
+
+
+def test_new_reduce_prompt_reuses_cached_map_results(prompts, tmp_path):
+    text = '\n\n'.join(_paragraph(f"p{i}_", 1000) for i in range(4))
+    generate_hierarchical_summary(text, 'Reduce A:\n{document}', chunk_words=1000, cache_dir=tmp_path)
+    assert len(_map_prompts(prompts)) == 4
+
+    prompts.clear()
+    generate_hierarchical_summary(text, 'Reduce B:\n{document}', chunk_words=1000, cache_dir=tmp_path)
+    assert _map_prompts(prompts) == []
+    assert len(prompts) == 1 and prompts[0].startswith('Reduce B:')
+
+
+def test_changed_chunk_prompt_is_not_served_from_cache(prompts, tmp_path):
+    text = '\n\n'.join(_paragraph(f"p{i}_", 1000) for i in range(2))
+    generate_hierarchical_summary(text, '{document}', chunk_words=1000, cache_dir=tmp_path)
+    prompts.clear()
+    chunk_prompt = generate_summary.get_chunk_prompt().replace('80-150', '50-100')
+    generate_hierarchical_summary(text, '{document}', chunk_prompt_template=chunk_prompt,
+                                  chunk_words=1000, cache_dir=tmp_path)
+    assert len(_map_prompts(prompts)) == 2
+
+
+def test_identical_chunks_are_summarized_concurrently(prompts, tmp_path):
+    text = '\n\n'.join([_paragraph('same', 1000)] * 6)
+    assert generate_hierarchical_summary(text, '{document}', chunk_words=1000, cache_dir=tmp_path) == 'final abstract'
+    assert [path.suffix for path in tmp_path.iterdir()] == ['.txt']
+
+
+# --- generate_summary_for_file ---
+def test_auto_mode_switches_on_document_length(prompts, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    short_path = tmp_path / 'short.txt'
+    long_path = tmp_path / 'long.txt'
+    short_path.write_text(_paragraph('s', 500), encoding='utf-8')
+    long_path.write_text('\n\n'.join(_paragraph(f"p{i}_", 1000) for i in range(3)), encoding='utf-8')
+
+    generate_summary_for_file(short_path, tmp_path / 'out' / 'short.txt', '{document}',
+                              mode='auto', min_hierarchical_words=1000)
+    assert len(prompts) == 1
+
+    prompts.clear()
+    generate_summary_for_file(long_path, tmp_path / 'out' / 'long.txt', '{document}',
+                              mode='auto', min_hierarchical_words=1000)
+    assert len(_map_prompts(prompts)) == 1  # 3,000 words fit in one default-sized chunk
+    assert len(prompts) == 2
+    assert (tmp_path / 'out' / 'long.txt').read_text(encoding='utf-8') == 'final abstract'